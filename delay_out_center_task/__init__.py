@@ -26,6 +26,8 @@ from .machine import Machine
 from .machine import states
 from .machine import state_transitions
 from .environment import Environment
+from .environment import get_environment
+from .environment import release_environment
 
 # Run doctests.
 if __name__ == '__main__':
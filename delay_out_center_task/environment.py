@@ -10,14 +10,19 @@ means for declaring the expectations of the task model. Any implementation of
 the environment should be a derivative of this class.
 
 The environment is expected to provide a clock, and a mechanism for setting 
-timers. For this purpose, this example / interface uses the [Timer] class from 
-the [threading] standard package. This should be replaced with whatever clock 
-is implementation-appropriate.
+timers. For this purpose, this example / interface provides a timer factory 
+with the same interface as the [Timer] class from the [threading] standard 
+package. Rather than starting a new thread for every timer, all timers are 
+served by a single, long-lived scheduler thread that waits on a heap of 
+deadlines measured by the [monotonic] clock. This should be replaced with 
+whatever clock is implementation-appropriate.
 
 [threading]: https://docs.python.org/3/library/threading.html
 
 [Timer]: https://docs.python.org/3/library/threading.html#timer-objects
 
+[monotonic]: https://docs.python.org/3/library/time.html#time.monotonic
+
 """
 
 # Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
@@ -30,9 +35,272 @@ is implementation-appropriate.
 
 
 # Imports.
-from threading import Timer
+import collections
+import collections.abc
+import heapq
+import math
+import os
+import threading
+import traceback
+import types
+from functools import lru_cache, partial
+from time import monotonic
+
+# Import numpy.
+import numpy
+
+
+# Timer classes.
+class _TimerHandle:
+    """ A timer scheduled by a :py:class:`_TimerManager`.
+    
+    The interface mirrors that of the [Timer] class from the [threading] 
+    package (i.e., `start`, `cancel`, `is_alive`, and `join`), but no thread 
+    is created. Cancellation merely flags the handle, which is discarded once 
+    its deadline is reached.
+    
+    [threading]: https://docs.python.org/3/library/threading.html
+    
+    [Timer]: https://docs.python.org/3/library/threading.html#timer-objects
+    """
+    
+    def __init__(self, manager, interval, function, 
+                       args=None, kwargs=None, quantum=0.0):
+        self._manager = manager
+        self.interval = interval
+        self.quantum = quantum
+        self.function = function
+        self.args = args if args is not None else []
+        self.kwargs = kwargs if kwargs is not None else {}
+        self._started = False
+        self._running = False
+        self._cancelled = False
+        self._finished = threading.Event()
+        
+    def start(self):
+        """ Schedule the timer. """
+        if self._started: raise RuntimeError('timers can only be started once')
+        self._started = True
+        self._manager.schedule(self)
+        
+    def cancel(self):
+        """ Stop the timer, if its callback has not yet been invoked. """
+        self._cancelled = True
+        if not self._running: self._finished.set()
+        
+    def is_alive(self):
+        """ Test whether or not the timer is scheduled or running. """
+        return self._started and not self._finished.is_set()
+        
+    def join(self, timeout=None):
+        """ Wait until the timer expires, or is cancelled. """
+        if not self._started:
+            raise RuntimeError('cannot join timer before it is started')
+        self._finished.wait(timeout)
+        
+    def _fire(self):
+        """ Invoke the timer callback, unless the timer has been cancelled. """
+        self._running = True
+        try:
+            if not self._cancelled: self.function(*self.args, **self.kwargs)
+        finally:
+            self._finished.set()
+    
+  
+
+class _TimerManager:
+    """ A scheduler that serves any number of timers from a single thread.
+    
+    Timers are grouped into buckets that share a monotonic-clock deadline, and 
+    the bucket deadlines are kept in a heap. If a timer specifies a non-zero 
+    quantum, then its deadline is rounded up to the next multiple of that 
+    quantum, so that timers that expire at nearly the same time are drained 
+    together, in a single wakeup. Within a bucket, timers expire in the order 
+    in which they were started. The scheduler thread is started when the 
+    first timer is scheduled, and it sleeps until the earliest deadline, or 
+    until a new timer is scheduled. Timer callbacks are invoked from the 
+    scheduler thread, and should therefore return promptly.
+    
+    Examples
+    --------
+    
+    Timers that are started within a single quantum share a bucket, and 
+    expire in the order in which they were started.
+    
+    >>> manager = _TimerManager()
+    >>> fired = []
+    >>> timers = [manager.timer(0.0, fired.append, args=[n], quantum=0.1) 
+    ...           for n in range(3)]
+    >>> for timer in timers: timer.start()
+    >>> len(manager._buckets)
+    1
+    >>> for timer in timers: timer.join()
+    >>> fired
+    [0, 1, 2]
+    >>> len(manager._buckets)
+    0
+    """
+    
+    def __init__(self):
+        self._reset()
+        
+    def _reset(self):
+        """ Discard all scheduled timers, and the scheduler thread.
+        
+        This is invoked in the child process after a fork. Only the forking 
+        thread survives in the child, so the scheduler thread is gone, and its 
+        lock might be held. A new thread is started when a timer is next 
+        scheduled.
+        """
+        self._heap = []
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        
+    def timer(self, interval, function, args=None, kwargs=None, quantum=0.0):
+        """ Create a timer that invokes a callback after a delay.
+        
+        The signature matches that of the `threading.Timer` constructor. As 
+        with `threading.Timer`, the timer must be started before it runs.
+        
+        Parameters
+        ----------
+        interval : float
+            Time delay, in seconds.
+        function : callable
+            Callback to invoke when the timer expires.
+        args, kwargs : list and dict, optional
+            Arguments for the callback.
+        quantum : float, optional
+            Timer resolution, in seconds. The deadline is rounded up to a 
+            multiple of this value. Defaults to zero (i.e., no rounding).
+        """
+        return _TimerHandle(self, interval, function, args, kwargs, quantum)
+        
+    def schedule(self, handle):
+        """ Add a timer handle to the bucket for its deadline, and wake the 
+            scheduler thread.
+        """
+        deadline = monotonic() + handle.interval
+        quantum = handle.quantum
+        if quantum > 0: deadline = math.ceil(deadline / quantum) * quantum
+        with self._lock:
+            bucket = self._buckets.get(deadline)
+            if bucket is None:
+                self._buckets[deadline] = bucket = []
+                heapq.heappush(self._heap, deadline)
+            bucket.append(handle)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, 
+                                                name='environment-timer', 
+                                                daemon=True)
+                self._thread.start()
+        self._wake.set()
+        
+    def _run(self):
+        """ Scheduler thread loop. """
+        heap = self._heap
+        buckets = self._buckets
+        while True:
+            
+            # Pop all expired buckets, and determine the time remaining until 
+            # the next deadline.
+            with self._lock:
+                self._wake.clear()
+                now = monotonic()
+                expired = []
+                while heap and (heap[0] <= now):
+                    expired.extend(buckets.pop(heapq.heappop(heap)))
+                timeout = (heap[0] - now) if heap else None
+            
+            # Invoke the callbacks outside of the lock, so that they are free 
+            # to schedule new timers.
+            for handle in expired:
+                try: handle._fire()
+                except Exception: traceback.print_exc()
+            
+            # Sleep until the next deadline, or until a timer is scheduled.
+            if not expired: self._wake.wait(timeout)
+    
+  
+
+# Initialize a timer manager shared by all environments.
+# Reset the manager in the child process after a fork, where the platform 
+# supports it.
+_timer_manager = _TimerManager()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_timer_manager._reset)
 
 
+# Define a kernel for testing many spheres at once.
+def _engaged_kernel(positions, radii, index, other, engaged):
+    """ Test whether or not each indexed sphere touches the `other` sphere.
+    
+    This function is compiled with [numba], if it is available. The result is 
+    written to the `engaged` array.
+    
+    [numba]: https://numba.pydata.org
+    """
+    x_c = positions[other, 0]
+    y_c = positions[other, 1]
+    z_c = positions[other, 2]
+    r_c = radii[other]
+    for n in range(index.shape[0]):
+        i = index[n]
+        dx = positions[i, 0] - x_c
+        dy = positions[i, 1] - y_c
+        dz = positions[i, 2] - z_c
+        r = radii[i] + r_c
+        engaged[n] = dx*dx + dy*dy + dz*dz <= r*r
+    
+@lru_cache(maxsize=None)
+def _compile_engaged_kernel():
+    """ Compile the kernel for testing many spheres at once.
+    
+    The numba package is imported on first use, so that it is not loaded 
+    unless many spheres are tested at once. Fast-math optimizations are not 
+    enabled, since contracting the arithmetic into fused multiply-add 
+    instructions could change the result for spheres that barely touch. 
+    Returns None if numba is not available.
+    """
+    try: import numba
+    except ImportError: return None
+    return numba.njit(cache=True)(_engaged_kernel)
+
+
+# Define a view of the objects in an environment.
+class _ObjectsView(collections.abc.Mapping):
+    """ A read-only, dynamic mapping between object keys and records of 
+        object attributes.
+    
+    Membership tests, iteration, and the length of the view are served by the 
+    index of object keys. A record of the attributes of an object is 
+    assembled only when the object is looked up.
+    """
+    
+    __slots__ = ('_index', '_radius', '_position', '_color')
+    
+    def __init__(self, index, radius, position, color):
+        self._index = index
+        self._radius = radius
+        self._position = position
+        self._color = color
+        
+    def __getitem__(self, key):
+        i = self._index[key]
+        return types.MappingProxyType({'radius': self._radius[i], 
+                                       'position': self._position[i], 
+                                       'color': self._color[i]})
+        
+    def __contains__(self, key): return key in self._index
+        
+    def __iter__(self): return iter(self._index)
+        
+    def __len__(self): return len(self._index)
+    
+  
+
 # Environment class.
 class Environment:
     """ A simple environment interface for tasks involving interaction between 
@@ -45,12 +313,24 @@ class Environment:
     In addition to object attribute accessor functions, this class provides 
     functionality for testing interaction between spherical objects.
     
+    Parameters
+    ----------
+    timer : callable, optional
+        A factory with the same signature as `threading.Timer`. Defaults to
+        the timer manager shared by all environments.
+    timer_quantum : float, optional
+        Resolution, in seconds, of the default timers. Timer deadlines are
+        rounded up to a multiple of this value, so that timers that expire at
+        nearly the same time are handled together. Defaults to 1 ms.
+    
     Attributes
     ----------
-    radius : dict of floats
-        A mapping between object keys and radius values.
-    position : dict of 3-tuples of floats
-        A mapping between object keys and tuples of 3D spatial coordinates.
+    objects : mapping of mappings
+        A read-only, dynamic view of the mapping between object keys and 
+        records of the radius, position, and color of each object. A record 
+        is assembled whenever an object is looked up, and is not updated when 
+        the object changes. Use the setter methods to modify object 
+        attributes.
     
     Examples
     --------
@@ -63,11 +343,18 @@ class Environment:
     the object is a unit sphere, that it is positioned at the origin, and that 
     it is opaque and colored black.
     
+    >>> list(environment.keys())
+    ['cursor']
     >>> import pprint
-    >>> pprint.pp(environment.objects)
-    {'cursor': {'radius': 1.0,
-                'position': (0.0, 0.0, 0.0),
-                'color': (0.0, 0.0, 0.0, 1.0)}}
+    >>> pprint.pp(dict(environment.objects['cursor']))
+    {'radius': 1.0, 'position': (0.0, 0.0, 0.0), 'color': (0.0, 0.0, 0.0, 1.0)}
+    
+    The object records cannot be modified directly.
+    
+    >>> environment.objects['cursor']['radius'] = 2.0
+    Traceback (most recent call last):
+    ...
+    TypeError: 'mappingproxy' object does not support item assignment
     
     Initialize a target sphere, and verify that the two spheres overlap.
     
@@ -75,6 +362,11 @@ class Environment:
     >>> environment.is_engaged('target')
     True
     
+    The `objects` view is dynamic, and reflects the new sphere.
+    
+    >>> 'target' in environment.objects
+    True
+    
     Set the position away from the origin, and verify that the two spheres 
     still overlap.
     
@@ -104,7 +396,7 @@ class Environment:
     
     >>> environment.set_radius(key='cursor')
     >>> environment.set_radius(key='target')
-    >>> environment.set_position(1.0, 1.0, 0.0, key='target')
+    >>> environment.set_position_xyz((1.0, 1.0, 0.0), key='target')
     >>> environment.is_engaged('target')
     True
     
@@ -115,31 +407,82 @@ class Environment:
     >>> environment.is_engaged('target')
     False
     
+    Initialize a cue sphere at the origin, and test both the `target` and the 
+    `cue` at once. Only the `cue` touches the `cursor`.
+    
+    >>> environment.initialize_sphere(key='cue')
+    >>> environment.is_engaged_many(['target', 'cue'])
+    array([False,  True])
+    
+    Move the target to the origin. Both spheres now touch the `cursor`.
+    
+    >>> environment.set_position(key='target')
+    >>> environment.is_engaged_many(['target', 'cue'])
+    array([ True,  True])
+    
     Change the RGBA color of the cursor and target.
     
     >>> environment.get_color()
     (0.0, 0.0, 0.0, 1.0)
     >>> environment.set_color(0.0, 1.0, 0.0)
-    >>> environment.set_color(b=1.0, a=0.5, key='target')
+    >>> environment.set_rgba((0.0, 0.0, 1.0, 0.5), key='target')
     >>> environment.get_color()
     (0.0, 1.0, 0.0, 1.0)
     
+    Attempting to modify an object that does not exist raises a `KeyError`.
+    
+    >>> environment.set_radius(1.0, key='missing')
+    Traceback (most recent call last):
+    ...
+    KeyError: 'missing'
+    
+    Reset the environment. Only the `cursor` remains, with default attributes.
+    
+    >>> environment.reset()
+    >>> list(environment.keys())
+    ['cursor']
+    >>> pprint.pp(dict(environment.objects['cursor']))
+    {'radius': 1.0, 'position': (0.0, 0.0, 0.0), 'color': (0.0, 0.0, 0.0, 1.0)}
+    
     """
     
-    def __init__(self, timer=Timer):
+    def __init__(self, timer=None, timer_quantum=0.001):
         
         # Initialize the spherical object attributes.
-        self.objects = {}
+        # Attributes are stored column-wise. Each object key is mapped to an 
+        # integer index into parallel lists of attribute values. The indices 
+        # of destroyed objects are recycled.
+        self._index = {}
+        self._radius = []
+        self._position = []
+        self._color = []
+        self._free = []
+        
+        # Initialize a read-only view of the object attributes.
+        self.objects = _ObjectsView(self._index, self._radius, 
+                                    self._position, self._color)
+        
+        # Cache copies of the position and radius lists as arrays, for testing 
+        # many objects at once. The cache is discarded whenever an object is 
+        # modified, and rebuilt on request.
+        self._arrays = None
         
         # Initialize a timer callable.
-        self.timer = timer
+        # By default, timers are served by the shared timer manager thread, 
+        # and deadlines are rounded to the timer quantum.
+        self.timer = timer if timer \
+                     else partial(_timer_manager.timer, quantum=timer_quantum)
         
         # Initialize a cursor object.
         self.initialize_sphere()
         
+    def keys(self):
+        """ A dynamic view of the keys of the objects in the environment. """
+        return self._index.keys()
+        
     def exists(self, key):
         """ Test whether or not an object exists in the environment. """
-        return key in self.objects
+        return key in self._index
         
     def initialize_sphere(self, key='cursor'):
         """ Initialize a sphere object.
@@ -149,12 +492,34 @@ class Environment:
         key : string
             Key or label used to identify the sphere object.
         """
-        assert key not in self.objects
-        self.objects[key] = {}
+        assert key not in self._index
+        if self._free:
+            self._index[key] = self._free.pop()
+        else:
+            self._index[key] = len(self._radius)
+            self._radius.append(None)
+            self._position.append(None)
+            self._color.append(None)
+        self._arrays = None
         self.set_radius(key=key)
         self.set_position(key=key)
         self.set_color(key=key)
     
+    def reset(self):
+        """ Restore the environment to its initial condition.
+        
+        All objects other than the cursor are destroyed, and the cursor 
+        attributes are restored to the default values. The attribute storage 
+        is retained, so that objects initialized after a reset re-use the 
+        existing slots.
+        """
+        for key in [k for k in self._index if (k != 'cursor')]:
+            self.destroy_sphere(key)
+        if 'cursor' not in self._index: self.initialize_sphere()
+        self.set_radius()
+        self.set_position()
+        self.set_color()
+    
     def destroy_sphere(self, key='cursor'):
         """ Destroy a sphere object.
         
@@ -163,7 +528,9 @@ class Environment:
         key : string
             Key or label used to identify the sphere object.
         """
-        if key in self.objects: del self.objects[key]
+        if key not in self._index: return
+        self._free.append(self._index.pop(key))
+        self._arrays = None
     
     def get_radius(self, key='cursor'):
         """ Get the current size of a sphere object.
@@ -173,7 +540,7 @@ class Environment:
         key : string
             Key or label used to identify the object.
         """
-        return self.objects[key]['radius']
+        return self._radius[self._index[key]]
         
     def set_radius(self, radius=1.0, key='cursor'):
         """ Set the current size of a sphere object.
@@ -185,8 +552,8 @@ class Environment:
         key : string
             Key or label used to identify a sphere object.
         """
-        assert key in self.objects
-        self.objects[key]['radius'] = radius
+        self._radius[self._index[key]] = radius
+        self._arrays = None
         
     def get_position(self, key='cursor'):
         """ Get the current position in space of the center of a sphere object.
@@ -196,7 +563,7 @@ class Environment:
         key : string
             Key or label used to identify the object.
         """
-        return self.objects[key]['position']
+        return self._position[self._index[key]]
         
     def set_position(self, x=0.0, y=0.0, z=0.0, key='cursor'):
         """ Set the current position of an object in space.
@@ -212,8 +579,25 @@ class Environment:
         key : string
             Key or label used to identify the object.
         """
-        assert key in self.objects
-        self.objects[key]['position'] = (x, y, z)
+        self._position[self._index[key]] = (x, y, z)
+        self._arrays = None
+        
+    def set_position_xyz(self, xyz, key='cursor'):
+        """ Set the current position of an object in space, from a sequence 
+            of coordinates.
+        
+        This is a convenience for callers that store coordinates as a sequence. 
+        It delegates to :py:meth:`set_position`, so that derived environments 
+        need only override that method.
+        
+        Parameters
+        ----------
+        xyz : tuple
+            Sequence of three position coordinates.
+        key : string
+            Key or label used to identify the object.
+        """
+        self.set_position(*xyz, key=key)
         
     def get_color(self, key='cursor'):
         """ Get the current color of a sphere object.
@@ -228,7 +612,7 @@ class Environment:
         rgba : tuple of floats
             A 4-tuple of RGB and alpha values.
         """
-        return self.objects[key]['color']
+        return self._color[self._index[key]]
         
     def set_color(self, r=0.0, g=0.0, b=0.0, a=1.0, key='cursor'):
         """ Set the current color of a sphere object.
@@ -242,8 +626,24 @@ class Environment:
         key : string
             Key or label used to identify a sphere object.
         """
-        assert key in self.objects
-        self.objects[key]['color'] = (r, g, b, a)
+        self._color[self._index[key]] = (r, g, b, a)
+        
+    def set_rgba(self, rgba, key='cursor'):
+        """ Set the current color of a sphere object, from a sequence of RGBA 
+            values.
+        
+        This is a convenience for callers that store colors as a sequence. It 
+        delegates to :py:meth:`set_color`, so that derived environments need 
+        only override that method.
+        
+        Parameters
+        ----------
+        rgba : tuple
+            Sequence of red, green, blue, and alpha values.
+        key : string
+            Key or label used to identify a sphere object.
+        """
+        self.set_color(*rgba, key=key)
         
     def is_engaged(self, key='target', other='cursor'):
         """ Tests whether or not a sphere overlaps with, or touches, another 
@@ -256,13 +656,126 @@ class Environment:
         other : string, optional
             Key or label used to identify a second sphere. Defaults to 'cursor'.
         """
-        p_t = self.objects[key]['position']
-        p_c = self.objects[other]['position']
-        d = sum([(t-c)**2 for (t, c) in zip(p_t, p_c)])
-        r_t = self.objects[key]['radius']
-        r_c = self.objects[other]['radius']
+        i = self._index[key]
+        j = self._index[other]
+        (x_t, y_t, z_t) = self._position[i]
+        (x_c, y_c, z_c) = self._position[j]
+        dx = x_t - x_c
+        dy = y_t - y_c
+        dz = z_t - z_c
+        r = self._radius[i] + self._radius[j]
+        
+        return dx*dx + dy*dy + dz*dz <= r*r
+        
+    def is_engaged_many(self, keys, other='cursor'):
+        """ Tests whether or not each of several spheres overlaps with, or 
+            touches, another sphere.
+        
+        The positions and radii are copied to arrays, which are cached until 
+        an object is next modified. For a handful of spheres, the overhead of 
+        the arrays outweighs the benefit, and :py:meth:`is_engaged` is faster.
         
-        return d <= (r_t + r_c)**2
+        Parameters
+        ----------
+        keys : iterable of strings
+            Keys or labels used to identify the spheres to test.
+        other : string, optional
+            Key or label used to identify a second sphere. Defaults to 'cursor'.
+        
+        Returns
+        -------
+        engaged : numpy.ndarray of bools
+            An array with one element per key, in the order given.
+        """
+        index = self._index
+        i = numpy.fromiter((index[k] for k in keys), dtype=numpy.intp)
+        j = index[other]
+        
+        # Copy the attribute lists to arrays, unless the cached arrays are 
+        # still current. The setters merely discard the cache, so that callers 
+        # that never test many objects at once do not pay for the arrays.
+        arrays = self._arrays
+        if arrays is None:
+            arrays = (numpy.array(self._position, dtype=float), 
+                      numpy.array(self._radius, dtype=float))
+            self._arrays = arrays
+        (positions, radii) = arrays
+        
+        # Use the compiled kernel, if numba is available.
+        kernel = _compile_engaged_kernel()
+        if kernel:
+            engaged = numpy.empty(len(i), dtype=bool)
+            kernel(positions, radii, i, j, engaged)
+            return engaged
+        
+        # Otherwise, vectorize with numpy. The squared distance is summed in 
+        # the same order as in `is_engaged`, so that the results agree exactly.
+        d = positions[i] - positions[j]
+        r = radii[i] + radii[j]
+        (dx, dy, dz) = d.T
+        return dx*dx + dy*dy + dz*dz <= r * r
+    
+  
+
+# Maintain a pool of environments that can be re-used, rather than 
+# re-constructed (e.g., for each trial of a simulation).
+_environment_pool = collections.deque()
+
+def get_environment():
+    """ Retrieve an environment from the pool of released environments.
+    
+    If the pool is empty, then a new environment is constructed, with the 
+    default arguments.
+    
+    Returns
+    -------
+    environment : Environment
+        An environment containing only a `cursor` object, with default 
+        attributes.
+    
+    Examples
+    --------
+    
+    >>> environment = get_environment()
+    >>> environment.initialize_sphere(key='target')
+    >>> release_environment(environment)
+    >>> get_environment() is environment
+    True
+    >>> list(environment.keys())
+    ['cursor']
+    
+    An environment cannot be released twice without being retrieved in 
+    between. Otherwise, it could be handed out to two callers.
+    
+    >>> release_environment(environment)
+    >>> release_environment(environment)
+    Traceback (most recent call last):
+    ...
+    ValueError: Environment has already been released.
+    >>> get_environment() is environment
+    True
+    """
+    try: return _environment_pool.pop()
+    except IndexError: return Environment()
+    
+def release_environment(environment):
+    """ Reset an environment, and return it to the pool for re-use.
+    
+    Parameters
+    ----------
+    environment : Environment
+        An environment retrieved via :py:func:`get_environment`. The 
+        environment should not be used after it has been released.
+    
+    Raises
+    ------
+    ValueError
+        If the environment has already been released to the pool.
+    """
+    if environment in _environment_pool:
+        raise ValueError('Environment has already been released.')
+    environment.reset()
+    _environment_pool.append(environment)
     
   
 
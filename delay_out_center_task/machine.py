@@ -28,9 +28,11 @@ Create a state machine, using the default arguments.
 'inactive'
 
 Create a convenient function for triggering events and reporting the state. 
-This is useful for simplifying the code in the examples that follow.
+This is useful for simplifying the code in the examples that follow. The 
+`fire` method triggers an event by name, via a cached reference to the 
+pytransitions trigger method.
 
->>> def trigger(state): return getattr(machine.model, state)()
+>>> def trigger(event): return machine.fire(event)
 
 Start a block of trials.
 
@@ -252,6 +254,58 @@ Terminate the block of trials.
 
 >>> success = trigger('end_block')
 State: inactive
+
+The destination of each transition can be looked up by source state and 
+trigger. Events that do not cause a transition from the current state can be 
+identified -- and ignored -- via this table, without invoking the 
+pytransitions event machinery.
+
+>>> machine.transition_table[('inactive', 'start_block')]
+'intertrial'
+>>> machine.fire('timeout')
+False
+>>> machine.state
+'inactive'
+
+Unknown event names are always an error. Invalid triggers are an error if the 
+machine is not configured to ignore them.
+
+>>> machine.fire('nonexistent_trigger')
+Traceback (most recent call last):
+...
+AttributeError: Do not know event named 'nonexistent_trigger'.
+>>> strict_machine = Machine(verbose=False, ignore_invalid_triggers=False)
+>>> strict_machine.fire('timeout')
+Traceback (most recent call last):
+...
+transitions.core.MachineError: "Can't trigger event timeout from state inactive!"
+
+Logging can be disabled altogether, in which case the logging callbacks are 
+never invoked.
+
+>>> quiet_machine = Machine(verbose=False)
+>>> quiet_machine.start_block()
+True
+>>> quiet_machine.state
+'intertrial'
+
+Alternatively, log messages can be buffered, and written in batches. The 
+buffer can also be flushed on request.
+
+>>> buffered_machine = Machine(log_buffer_size=1024)
+>>> success = buffered_machine.start_block(); buffered_machine.flush_log()
+State: intertrial
+
+Logging can also be restricted to a subset of states. Transitions into other 
+states do not invoke any logging callbacks.
+
+>>> sparse_machine = Machine(logged_states=['intertrial', 'failure'])
+>>> success = sparse_machine.start_block()
+State: intertrial
+>>> success = sparse_machine.fire('timeout')
+>>> success = sparse_machine.to_move_a()
+>>> success = sparse_machine.fire('timeout')
+State: failure
 """
 
 
@@ -264,6 +318,14 @@ State: inactive
 # Contact: a.whit (nml@whit.contact)
 
 
+# Import standard Python packages.
+import os
+import sys
+import atexit
+import weakref
+import threading
+import collections
+
 # Import the transitions state machine package.
 import transitions
 import transitions.extensions
@@ -324,7 +386,6 @@ state_transitions \
        dict(trigger='target_engaged',    source='move_c',     dest='hold_c'),
        dict(trigger='timeout',           source='move_c',     dest='failure'),
        dict(trigger='timeout',           source='hold_c',     dest='success'),
-       dict(trigger='timeout',           source='move_c',     dest='failure'),
        dict(trigger='target_disengaged', source='hold_c',     dest='failure'),
       ]
 """
@@ -347,6 +408,164 @@ The transitions defined here fall into three categories:
 """
 
 
+# Define a function for checking state transitions.
+def validate_transitions(transitions):
+    """ Remove duplicate transition records, and verify that the remaining 
+        unconditional transitions are unambiguous.
+    
+    Only transitions specified as dict records are checked. Other transition 
+    specifications are passed through unaltered.
+    
+    Parameters
+    ----------
+    transitions : list
+        State transition records, as described for :py:attr:`state_transitions`.
+    
+    Returns
+    -------
+    transitions : list
+        The transition records, in order, with duplicate records removed.
+    
+    Raises
+    ------
+    ValueError
+        If two unconditional transitions with the same trigger and source 
+        state specify different destination states.
+    
+    Examples
+    --------
+    
+    >>> records = [dict(trigger='go', source='a', dest='b'),
+    ...            dict(trigger='go', source='a', dest='b')]
+    >>> validate_transitions(records)
+    [{'trigger': 'go', 'source': 'a', 'dest': 'b'}]
+    >>> records.append(dict(trigger='go', source='a', dest='c'))
+    >>> validate_transitions(records)
+    Traceback (most recent call last):
+    ...
+    ValueError: Conflicting destinations for trigger 'go' from state 'a'.
+    """
+    records = []
+    destinations = {}
+    for transition in transitions:
+        
+        # Pass through anything that is not a dict record, and drop duplicates.
+        if not isinstance(transition, dict): 
+            records.append(transition)
+            continue
+        if transition in records: continue
+        records.append(transition)
+        
+        # Conditional transitions might legitimately share a source and 
+        # trigger.
+        if transition.get('conditions') or transition.get('unless'): continue
+        
+        # Verify that the destination is unambiguous.
+        trigger = transition['trigger']
+        source = transition['source']
+        source = tuple(source) if isinstance(source, list) else source
+        dest = transition.get('dest')
+        if destinations.setdefault((trigger, source), dest) != dest:
+            message = f'Conflicting destinations for trigger {trigger!r} ' \
+                      f'from state {source!r}.'
+            raise ValueError(message)
+    
+    return records
+
+
+# Validate the default state transitions once, at import time, rather than 
+# each time a machine is constructed.
+_validated_state_transitions = validate_transitions(state_transitions)
+
+
+# Define a background writer for buffered log messages.
+class _LogWriter:
+    """ A background thread that periodically writes the buffered log 
+        messages of any number of state machines to the standard output.
+    
+    The thread is started when the first machine is registered. Machines are 
+    referenced weakly, so registration does not keep a machine alive. Any 
+    remaining messages are written when the interpreter exits.
+    """
+    
+    def __init__(self, interval=0.100):
+        self.interval = interval
+        self._machines = weakref.WeakSet()
+        self._reset()
+        atexit.register(self.flush)
+        
+    def _reset(self):
+        """ Discard the writer thread, and start a new one if any machines 
+            are registered.
+        
+        This is invoked in the child process after a fork. Only the forking 
+        thread survives in the child, so the writer thread is gone, and its 
+        lock might be held.
+        """
+        self._lock = threading.Lock()
+        self._thread = None
+        if self._machines: self._start()
+        
+    def _start(self):
+        """ Start the writer thread. """
+        self._thread = threading.Thread(target=self._run, 
+                                        name='machine-log-writer', 
+                                        daemon=True)
+        self._thread.start()
+        
+    def register(self, machine):
+        """ Periodically write the buffered log messages of a machine. """
+        with self._lock:
+            self._machines.add(machine)
+            if self._thread is None: self._start()
+        
+    def flush(self):
+        """ Write the buffered log messages of all registered machines. """
+        with self._lock: machines = list(self._machines)
+        for machine in machines: machine.flush_log()
+        
+    def _run(self):
+        """ Writer thread loop. """
+        event = threading.Event()
+        while not event.wait(self.interval): self.flush()
+    
+  
+
+# Initialize a log writer shared by all machines.
+# Reset the writer in the child process after a fork, where the platform 
+# supports it.
+_log_writer = _LogWriter()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_log_writer._reset)
+
+
+# Define an event class that rejects invalid triggers before processing.
+class Event(transitions.Event):
+    """ A pytransitions event that ignores invalid triggers up front.
+    
+    When the current state of a model is configured to ignore invalid 
+    triggers, an event that does not define a transition from that state 
+    returns immediately, without constructing event data, invoking the 
+    preparation callbacks, or logging a warning. Such events are identified 
+    via a table compiled by the machine. Events are passed to pytransitions 
+    regardless, if the machine defines finalization callbacks -- which are 
+    expected to run for every event -- or if events are queued, since the 
+    validity of a queued event depends on the state at the time that it is 
+    processed.
+    """
+    
+    def trigger(self, model, *args, **kwargs):
+        """ Trigger the event, if it is valid for the current model state. """
+        machine = self.machine
+        if machine._transition_table is None: machine._compile_transitions()
+        state = getattr(model, machine.model_attribute)
+        if ((state, self.name) in machine._ignored_triggers) \
+           and not machine.finalize_event:
+            return False
+        return super().trigger(model, *args, **kwargs)
+    
+  
+
 # For convenience, define a model class.
 #class Machine(transitions.extensions.LockedMachine):
 class Machine(transitions.Machine):
@@ -359,30 +578,213 @@ class Machine(transitions.Machine):
     
     [pytransitions]: https://github.com/pytransitions/transitions#-transitions
     
+    Parameters
+    ----------
+    
+    verbose : bool, optional
+        If False, then events and state changes are not logged, and the logging 
+        callbacks are not registered with the state machine at all. Defaults 
+        to True.
+    log_buffer_size : int, optional
+        If specified, then log messages are appended to a ring buffer of this 
+        size, rather than printed immediately. A background thread writes the 
+        buffered messages to the standard output in batches, every 100 ms. If 
+        messages arrive faster than they are written, then the oldest messages 
+        are discarded, and the number of discarded messages is reported with 
+        the next batch. Defaults to None (i.e., unbuffered).
+    logged_states : list, optional
+        If specified, then only transitions into the listed states are logged. 
+        Instead of registering global callbacks that run for every event and 
+        state change, logging callbacks are attached only to the listed states 
+        and to the transitions that lead into them. All other transitions run 
+        without any logging callbacks. Ignored if `verbose` is False. Defaults 
+        to None (i.e., all events and state changes are logged).
+    
     See Also
     --------
 
     model.Model : Prototype model associated with this state machine.
     """
+    
+    event_cls = Event
+    
     def __init__(self, *args,
                        states=states,
                        transitions=state_transitions,
                        initial='inactive',
+                       verbose=True,
+                       log_buffer_size=None,
+                       logged_states=None,
                        **kwargs):
+        self._log_buffer = collections.deque(maxlen=log_buffer_size) \
+                           if log_buffer_size else None
+        self._log_dropped = 0
+        logging_kwargs = {'prepare_event': self.log_event,
+                          'after_state_change': self.log_state_change} \
+                         if (verbose and (logged_states is None)) else {}
+        transitions = _validated_state_transitions \
+                      if (transitions is state_transitions) \
+                      else validate_transitions(transitions)
         kwargs = {'states': states, 
                   'transitions': transitions, 
                   'initial': initial,
                   'ignore_invalid_triggers': True, # 
                   'send_event': True,
-                  'prepare_event': self.log_event,
-                  'after_state_change': self.log_state_change,
+                  **logging_kwargs,
                   **kwargs}
+        self._transition_table = None
         super().__init__(*args, **kwargs)
-        self._verbose = False
+        if verbose and (logged_states is not None):
+            self._add_logging_callbacks(logged_states)
+        if self._log_buffer is not None: _log_writer.register(self)
+        
+    def _add_logging_callbacks(self, logged_states):
+        """ Attach logging callbacks to a subset of states, and to the 
+            transitions that lead into them.
+        
+        The state change callback is placed ahead of any model callbacks, so 
+        that states that transition automatically upon entry are logged before 
+        the subsequent state.
+        """
+        logged_states = set(logged_states)
+        for name in logged_states:
+            self.get_state(name).on_enter.insert(0, self.log_state_change)
+        for event in self.events.values():
+            for records in event.transitions.values():
+                for transition in records:
+                    if transition.dest not in logged_states: continue
+                    transition.before.insert(0, self.log_event)
+        
+    @property
+    def transition_table(self):
+        """ A mapping between (source, trigger) pairs and destination states.
+        
+        The table is compiled from the pytransitions events on first use, and 
+        re-compiled whenever transitions are added or removed. If multiple 
+        transitions share a source and a trigger, then the destination of the 
+        first transition is recorded. Internal transitions map to `None`.
+        
+        State and trigger names are interned, so that key comparisons reduce to 
+        identity checks. The names declared in this module are string literals, 
+        and are interned already, but the names of automatic transitions 
+        (e.g., `to_move_a`) are generated at run time.
+        """
+        if self._transition_table is None: self._compile_transitions()
+        return self._transition_table
+        
+    def _compile_transitions(self):
+        """ Compile the transition table, cache the bound trigger method of 
+            each pytransitions event, and compile the invalid triggers that 
+            can be ignored up front.
+        """
+        intern = sys.intern
+        self._transition_table \
+          = {(intern(source), intern(trigger)): transitions[0].dest
+             for (trigger, event) in self.events.items()
+             for (source, transitions) in event.transitions.items()
+             if transitions}
+        self._event_triggers \
+          = {intern(trigger): event.trigger
+             for (trigger, event) in self.events.items()}
+        
+        # Compile the (state, trigger) pairs that can be ignored without 
+        # invoking pytransitions: i.e., the events that do not define a 
+        # transition from a state that is configured to ignore invalid 
+        # triggers. States are keyed by the value held by the model attribute, 
+        # which differs from the state name for enumerated states. If events 
+        # are queued, then validity cannot be determined in advance.
+        self._ignored_triggers = set()
+        if self.has_queue: return
+        for state in self.states.values():
+            ignore = state.ignore_invalid_triggers
+            ignore = self.ignore_invalid_triggers if (ignore is None) else ignore
+            if not ignore: continue
+            value = state.value
+            value = intern(value) if isinstance(value, str) else value
+            self._ignored_triggers.update(
+                (value, trigger) for (trigger, event) in self.events.items()
+                if state.name not in event.transitions)
+        
+    def add_states(self, *args, **kwargs):
+        """ Add states, and invalidate the transition table. """
+        super().add_states(*args, **kwargs)
+        self._transition_table = None
+        
+    def add_transition(self, trigger, source, dest, *args, **kwargs):
+        """ Add a transition, and invalidate the transition table. """
+        super().add_transition(trigger, source, dest, *args, **kwargs)
+        self._transition_table = None
+        
+    def remove_transition(self, trigger, source='*', dest='*'):
+        """ Remove a transition, and invalidate the transition table. """
+        super().remove_transition(trigger, source=source, dest=dest)
+        self._transition_table = None
+        
+    def fire(self, trigger, *args, **kwargs):
+        """ Trigger an event for the model of the state machine.
+        
+        The event is dispatched via the cached trigger method of the 
+        pytransitions event, without looking up a trigger attribute of the 
+        model. Invalid triggers are handled by :py:meth:`Event.trigger`.
+        
+        Parameters
+        ----------
+        trigger : string
+            Name of the event to trigger.
+        *args, **kwargs
+            Arguments passed to the pytransitions event.
+        
+        Returns
+        -------
+        success : bool
+            True if a transition was executed.
+        
+        Raises
+        ------
+        AttributeError
+            If no event with the specified name is defined.
+        transitions.MachineError
+            If the event does not define a transition from the current state, 
+            and the state is not configured to ignore invalid triggers.
+        """
+        if self._transition_table is None: self._compile_transitions()
+        event_trigger = self._event_triggers.get(trigger)
+        if event_trigger is None:
+            raise AttributeError(f'Do not know event named {trigger!r}.')
+        return event_trigger(self.model, *args, **kwargs)
         
     def log(self, message, severity=None): 
         """ Record a message in the log. """
-        print(message, flush=True)
+        buffer = self._log_buffer
+        if buffer is None: 
+            print(message, flush=True)
+            return
+        if len(buffer) == buffer.maxlen: self._log_dropped += 1
+        buffer.append(message)
+        
+    def flush_log(self):
+        """ Write any buffered log messages to the standard output. """
+        
+        # Drain the buffer. The buffer might also be drained concurrently, by 
+        # the log writer thread.
+        buffer = self._log_buffer
+        messages = []
+        try:
+            while buffer: messages.append(buffer.popleft())
+        except IndexError: pass
+        
+        # Report any messages that were discarded because the buffer was full.
+        # The count is approximate, since messages might be logged 
+        # concurrently.
+        dropped = self._log_dropped
+        if dropped:
+            self._log_dropped = 0
+            messages.insert(0, f'Log: {dropped} messages dropped')
+        
+        # Write the messages.
+        if not messages: return
+        sys.stdout.write('\n'.join(messages) + '\n')
+        sys.stdout.flush()
         
     def log_state_change(self, event_data):
         """ Log changes in the state machine state.
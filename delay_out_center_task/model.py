@@ -15,12 +15,12 @@ Declare additional functionality for verifying timeout intervals. This is just
 a covenient way to demonstrate that the task delays are behaving as we expect 
 them to.
 
->>> from time import time
+>>> from time import perf_counter_ns
 >>> def time_timeout(fun, *args, **kwargs):
-...     t0 = time()
+...     t0 = perf_counter_ns()
 ...     fun(*args, **kwargs)
-...     model.timeout_timer.join()
-...     return time() - t0
+...     model.timeout_event.wait()
+...     return (perf_counter_ns() - t0) / 1e9
 >>> tol = 0.005 # 5ms
 
 When used in conjunction with a pytransitions state machine, the `trigger` 
@@ -51,17 +51,17 @@ default attribute values.
 No other objects should be present in the environment, at this time, but 
 spheres can be initialized and destroyed when required. Verify this mechanism.
 
->>> len(environment.objects) == 1
+>>> len(environment.keys()) == 1
 True
 >>> environment.initialize_sphere(key='test')
->>> len(environment.objects) == 2
+>>> len(environment.keys()) == 2
 True
 >>> environment.get_radius('test')
 1.0
 >>> environment.get_position('test')
 (0.0, 0.0, 0.0)
 >>> environment.destroy_sphere(key='test')
->>> len(environment.objects) == 1
+>>> len(environment.keys()) == 1
 True
 >>> try: environment.get_position('test')
 ... except KeyError: print('Object does not exist')
@@ -76,6 +76,12 @@ Trigger: timeout
 >>> abs(delta - 0.100) < 0.01
 True
 
+Very short timeouts are handled inline, without a timer. The callback is 
+invoked before the function returns.
+
+>>> model.set_timeout(timeout_s=0.0005)
+Trigger: timeout
+
 This class also includes a convenience function for setting timeouts based on 
 parameter values. In this example, the parameters have been set to default 
 values. Verify that the parameterized timeout for the `move_a` state matches 
@@ -244,6 +250,19 @@ Trigger: timeout
 True
 >>> model.on_exit_failure()
 
+A timeout parameter of zero triggers the timeout immediately. The 
+`timeout_event` flag is still set, so that waiting threads are released.
+
+>>> timeout_s = model.parameters['timeout_s.success']
+>>> model.parameters['timeout_s.success'] = 0.0
+>>> model.timeout_event.clear()
+>>> model.on_enter_success()
+Trigger: timeout
+>>> model.timeout_event.is_set()
+True
+>>> model.on_exit_success()
+>>> model.parameters['timeout_s.success'] = timeout_s
+
 Both the `success` and `failure` states transition to a trial teardown state. 
 As the trial ends, the target is destroyed.
 
@@ -267,8 +286,13 @@ The task then moves to the inter-trial state, and then to a new trial.
 
 
 # Imports.
-import yaml
-import numpy.random
+import os
+import copy
+import sys
+import time
+import random
+import threading
+import functools
 
 
 # Define the default target set.
@@ -294,6 +318,141 @@ stored at the path specified by the optional parameter `paths.target_file`.
 """
 
 
+# Define a function for extracting target positions.
+def target_positions(targets):
+    """ Extract the position of each target record, as an (x, y, z) tuple.
+    
+    Parameters
+    ----------
+    targets : dict
+        A mapping between target keys and target records, as described for 
+        :py:data:`default_targets`.
+    
+    Returns
+    -------
+    positions : tuple
+        Coordinate tuples, in the order of the target records. Unspecified 
+        coordinates default to zero.
+    
+    Examples
+    --------
+    
+    >>> target_positions({'a': dict(position=dict(x=1.0, z=2.0))})
+    ((1.0, 0.0, 2.0),)
+    """
+    return tuple(tuple(t['position'].get(k, 0.0) for k in 'xyz')
+                 for t in targets.values())
+
+default_target_positions = target_positions(default_targets)
+""" Coordinate tuples for the default target set, shared by all models. """
+
+
+# Define the home target position.
+# For now, this is hard-coded as the origin.
+# In the future, it can be made part of the configuration.
+home_position = (0.0, 0.0, 0.0)
+
+
+# Define the parameter keys for the cursor and target colors, in RGBA order.
+cursor_color_keys = tuple(f'cursor.color.{k}' for k in 'rgba')
+target_color_keys = tuple(f'target.color.{k}' for k in 'rgba')
+
+# Define the default RGBA values for channels that are not specified in a 
+# target record.
+default_rgba = (0.0, 0.0, 0.0, 1.0)
+
+
+# Define a cache for target files.
+@functools.lru_cache(maxsize=8)
+def _load_yaml(filepath, mtime_ns):
+    """ Parse a YAML file.
+    
+    Parsed files are cached, so that a file is only parsed once per process, 
+    unless it is modified. The modification time is part of the cache key, and 
+    is otherwise unused. The cached result is shared, so callers must copy it 
+    before handing it out. The C implementation of the YAML loader is used, if 
+    available.
+    
+    The YAML package is imported on first use, so that it is not loaded 
+    unless a target file is specified.
+    """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(filepath, 'rb') as f: return yaml.load(f, Loader=loader)
+
+
+# Define a flag for signalling completed timeouts.
+class _TimeoutEvent:
+    """ A flag that signals completed timeouts.
+    
+    The interface mirrors that of the [Event] class from the [threading] 
+    package (i.e., `set`, `clear`, `is_set`, and `wait`). A completed timeout 
+    is signalled via :py:meth:`signal`, once the transition that follows the 
+    timeout has finished. Threads blocked in `wait` are released, but the flag 
+    remains clear if a new timeout was requested -- via `clear` -- during the 
+    transition, so that it is never left set while a timeout is pending.
+    
+    [threading]: https://docs.python.org/3/library/threading.html
+    
+    [Event]: https://docs.python.org/3/library/threading.html#event-objects
+    
+    Examples
+    --------
+    
+    >>> event = _TimeoutEvent()
+    >>> generation = event.generation
+    >>> event.clear()  # A new timeout is requested during the transition.
+    >>> event.signal(generation)
+    >>> event.is_set()
+    False
+    >>> event.signal(event.generation)
+    >>> event.is_set()
+    True
+    >>> event.wait()
+    True
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._flag = False
+        self._count = 0
+        self.generation = 0
+        
+    def is_set(self):
+        """ Test whether or not a timeout has completed since the most recent 
+            timeout request.
+        """
+        return self._flag
+        
+    def clear(self):
+        """ Reset the flag, upon a new timeout request. """
+        with self._condition:
+            self._flag = False
+            self.generation += 1
+        
+    def set(self):
+        """ Set the flag, and release any waiting threads. """
+        self.signal(self.generation)
+        
+    def signal(self, generation):
+        """ Release any waiting threads, and set the flag unless a timeout has 
+            been requested since the specified generation.
+        """
+        with self._condition:
+            self._flag = (generation == self.generation)
+            self._count += 1
+            self._condition.notify_all()
+        
+    def wait(self, timeout=None):
+        """ Wait until the flag is set, or the next timeout completes. """
+        with self._condition:
+            if self._flag: return True
+            count = self._count
+            return self._condition.wait_for(lambda: self._count != count, 
+                                            timeout)
+    
+  
+
 # Define the task model.
 class Model:
     """ Delayed center-out, out-centers cursor task model prototype.
@@ -313,15 +472,65 @@ class Model:
         A mapping between parameter keys and values.
     log : callable
         A callable that provides a mechanism for logging status messages.
+    auto_timeout : bool, optional
+        If False, then expired timeout timers do not trigger the `timeout` 
+        event, and the `timeout` event must instead be triggered manually. 
+        This is useful for testing. Defaults to True.
+    seed : int, optional
+        If specified, then targets are chosen via a pseudo-random number 
+        generator that is private to this model, and initialized with this 
+        seed. Otherwise, a generator shared by all models is used.
     
     See Also
     --------
     
     machine.Machine : Center-out state machine associated with this model.
+    
+    Examples
+    --------
+    
+    Models initialized with the same seed choose the same sequence of targets.
+    
+    >>> from .environment import Environment
+    >>> def choose_targets(model, n=10):
+    ...     return [model.choose_random_target_index() for _ in range(n)]
+    >>> m1 = Model(environment=Environment(), log=lambda m: None, seed=1)
+    >>> m2 = Model(environment=Environment(), log=lambda m: None, seed=1)
+    >>> choose_targets(m1) == choose_targets(m2)
+    True
+    >>> m1._prng is Model._prng
+    False
+    
+    Models initialized without a seed share a generator.
+    
+    >>> m3 = Model(environment=Environment(), log=lambda m: None)
+    >>> m3._prng is Model._prng
+    True
     """
     
-    def __init__(self, environment, parameters={}, log=None):
-        self._prng = numpy.random.default_rng()
+    # Declare the attributes of the model. The instance dictionary is retained, 
+    # because pytransitions attaches the state attribute, trigger methods, and 
+    # convenience methods to each model instance. It also holds the private 
+    # pseudo-random number generator of a seeded model, which shadows the 
+    # shared generator.
+    __slots__ = ('log', 'parameters', '_targets', 'target_index', 
+                 'timeout_timer', 'timeout_event', '_environment', 
+                 '_timeout_keys', '_target_xyz', '_initialize_sphere', 
+                 '_destroy_sphere', '_set_radius', '_set_position_xyz', 
+                 '_set_rgba', '_armed', 'auto_timeout', '__dict__')
+    
+    synchronous_timeout_s = 0.001
+    """ Timeouts shorter than this interval, in seconds, are handled inline 
+        by :py:meth:`set_timeout`, rather than by a timer. """
+    
+    _prng = random.Random()
+    
+    def __init__(self, environment, parameters={}, log=None, 
+                       auto_timeout=True, seed=None):
+        self.auto_timeout = auto_timeout
+        if seed is not None: self._prng = random.Random(seed)
+        self.timeout_event = _TimeoutEvent()
+        self._armed = False
         self.environment = environment
         self.log = log if log else lambda m: print(m, flush=True)
         self.initialize_parameters(parameters)
@@ -331,6 +540,42 @@ class Model:
         self.cancel_timeout()
         
     def __del__(self): self.cancel_timeout()
+    
+    @property
+    def environment(self):
+        """ The environment interface.
+        
+        The environment methods invoked upon state transitions are bound when 
+        the environment is assigned, so that they need not be looked up anew 
+        on each transition.
+        """
+        return self._environment
+        
+    @environment.setter
+    def environment(self, environment):
+        self._environment = environment
+        self._initialize_sphere = environment.initialize_sphere
+        self._destroy_sphere = environment.destroy_sphere
+        self._set_radius = environment.set_radius
+        self._set_position_xyz = environment.set_position_xyz
+        self._set_rgba = environment.set_rgba
+        
+    @property
+    def targets(self):
+        """ A mapping between target keys and target records.
+        
+        The position of each target is pre-computed as a coordinate tuple 
+        whenever the targets are assigned. Records that are modified in place 
+        should therefore be re-assigned, so that the positions are updated.
+        """
+        return self._targets
+        
+    @targets.setter
+    def targets(self, targets):
+        self._targets = targets
+        self._target_xyz = default_target_positions \
+                           if (targets is default_targets) \
+                           else target_positions(targets)
         
     def initialize_parameters(self, parameters):
         """ Declare and set defaults for all parameters used in the cursor task.
@@ -376,6 +621,11 @@ class Model:
         # Set target file path.
         set_default('paths.targets', '') #None) #'config/targets.yaml')
         
+        # Pre-compute the timeout parameter keys, indexed by state.
+        self._timeout_keys = {k.split('.', 1)[1]: sys.intern(k) 
+                              for k in self.parameters 
+                              if k.startswith('timeout_s.')}
+        
     def set_parameterized_timeout(self, key, **kwargs):
         """ Request that the timer invoke the timeout callback after a delay 
             specified by a parameter.
@@ -387,10 +637,19 @@ class Model:
             parameter namespace or tree.
         **kwargs : dict
             Keyword arguments for the `set_timeout` function.
+        
+        If the parameter is not positive, then the `timeout` event is 
+        triggered immediately. The `timeout_event` flag is signalled after the 
+        trigger, as for a timer.
         """
-        timeout_s = self.parameters[f'timeout_s.{key}']
-        if timeout_s <= 0: self.trigger('timeout')
-        else: self.set_timeout(timeout_s=timeout_s, **kwargs)
+        parameter_key = self._timeout_keys.get(key) or f'timeout_s.{key}'
+        timeout_s = self.parameters[parameter_key]
+        if timeout_s > 0: 
+            self.set_timeout(timeout_s=timeout_s, **kwargs)
+            return
+        generation = self.timeout_event.generation
+        self.trigger('timeout')
+        self.timeout_event.signal(generation)
         
     def set_timeout(self, timeout_s, callback=None, start=True):
         """ Request that the timer invoke the timeout callback after the 
@@ -405,26 +664,57 @@ class Model:
           member, if no argument is provided.
         start : bool
           Specify false to setup the timer without starting it.
+        
+        Timeouts shorter than :py:attr:`synchronous_timeout_s` are not worth 
+        the overhead of a timer. For such timeouts, the delay is imposed via 
+        `time.sleep`, and the callback is invoked immediately, in the calling 
+        thread.
         """
+        self.timeout_event.clear()
         callback = callback if callback else self.timeout
+        if start and (timeout_s < self.synchronous_timeout_s):
+            if timeout_s > 0: time.sleep(timeout_s)
+            callback()
+            return
         self.timeout_timer = self.environment.timer(timeout_s, callback)
+        self._armed = True
         if start: self.timeout_timer.start()
         
     def cancel_timeout(self):
         """ Cancel any timeout timer that might be set. """
         
         # Cancel the timer if it is set.
-        if hasattr(self, 'timeout_timer'):
-            if self.timeout_timer.is_alive(): self.timeout_timer.cancel()
+        # The timer is disarmed once it has been cancelled, so that subsequent 
+        # requests -- e.g., from the exit callback that follows a timeout -- 
+        # have no work to do.
+        if not getattr(self, '_armed', False): return
+        self._armed = False
+        self.timeout_timer.cancel()
         
     def timeout(self, *args, **kwargs):
-        """ Timeout trigger function. """
+        """ Timeout trigger function.
+        
+        The `timeout_event` flag is signalled once the `timeout` event has been 
+        triggered, and is cleared whenever a new timeout is requested, so that 
+        other threads can wait for a timeout without reference to the timer 
+        implementation. Waiting threads are released after the transition 
+        that follows the timeout. If that transition requests a new timeout, 
+        then the flag remains clear, so that it is never left set while a 
+        timeout is pending.
+        
+        If automatic timeouts are disabled, then this function has no effect.
+        """
+        if not self.auto_timeout: return
         
         # Reset the timeout timer.
         self.cancel_timeout()
         
         # Trigger the timeout event.
-        return self.trigger('timeout')
+        # Signal any threads waiting for the timeout.
+        generation = self.timeout_event.generation
+        result = self.trigger('timeout')
+        self.timeout_event.signal(generation)
+        return result
     
     def load_targets(self, filepath=''):
         """ Load target parameters from file, or a default constant.
@@ -441,14 +731,19 @@ class Model:
         """
         
         # Set the default.
-        self.targets = default_targets
+        targets = default_targets
         
         # Load targets from a YAML file, if a file path is provided.
         filepath = filepath \
                    if filepath \
                    else self.parameters.get('file_path.targets', None)
         if filepath:
-            with open(filepath, 'r') as f: self.targets = yaml.safe_load(f)
+            mtime_ns = os.stat(filepath).st_mtime_ns
+            targets = copy.deepcopy(_load_yaml(filepath, mtime_ns))
+        
+        # Assign the targets. The target positions are pre-computed upon 
+        # assignment.
+        self.targets = targets
         
         # Report.
         message = f'Loaded targets from {filepath}'
@@ -462,33 +757,29 @@ class Model:
         """ Set the current target index to a (uniformly) randomly-chosen index 
             into the list of target parameter records.
         """
-        return self._prng.integers(len(self.targets))
+        return self._prng.randrange(len(self.targets))
         
     def set_home_target(self):
         """ Set the home (or "center") target parameters.
         """
         
         # Move the target to the home position.
-        # For now, this is hard-coded as the origin.
-        # In the future, it can be made part of the configuration.
-        target = dict(position=(0.0, 0.0, 0.0))
-        xyz = target['position']
-        self.environment.set_position(*xyz, key='target')
+        self._set_position_xyz(home_position, key='target')
         
     def update_cursor_radius(self):
         """ Update the cursor radius in the environment to match the current 
             parameter value.
         """
         radius = self.parameters[f'cursor.radius']
-        self.environment.set_radius(radius, key='cursor')
+        self._set_radius(radius, key='cursor')
         
     def update_cursor_color(self):
         """ Update the cursor color in the environment to match the current 
             parameter value.
         """
-        keys = ['r', 'g', 'b', 'a']
-        rgba_map = {k: self.parameters[f'cursor.color.{k}'] for k in keys}
-        self.environment.set_color(**rgba_map, key='cursor')
+        parameters = self.parameters
+        rgba = tuple(parameters[k] for k in cursor_color_keys)
+        self._set_rgba(rgba, key='cursor')
     
     def update_target_radius(self, key='target', from_active_target=True):
         """ Update the target radius in the environment to match the current 
@@ -504,7 +795,7 @@ class Model:
         # Set to the radius of the active target, if specified.
         # Otherwise, set to the default target radius.
         radius = target.get('radius', self.parameters['target.radius'])
-        self.environment.set_radius(radius, key=key)
+        self._set_radius(radius, key=key)
         
     def update_target_color(self, key='target', from_active_target=True):
         """ Update the target color in the environment to match the current 
@@ -519,17 +810,21 @@ class Model:
         # Set the target color.
         # Set to the color of the active target, if specified.
         # Otherwise, set to the default target color.
-        keys = ['r', 'g', 'b', 'a']
-        rgba_map = {k: self.parameters[f'target.color.{k}'] for k in keys}
-        rgba_map = target.get('color', rgba_map)
-        self.environment.set_color(**rgba_map, key=key)
+        if 'color' in target:
+            color = target['color']
+            rgba = tuple(color.get(k, v) 
+                         for (k, v) in zip('rgba', default_rgba))
+        else:
+            parameters = self.parameters
+            rgba = tuple(parameters[k] for k in target_color_keys)
+        self._set_rgba(rgba, key=key)
     
     def on_enter_inactive(self, event_data=None):
         """ Initialize the "inactive" state. """
         
         # Destroy all objects in the environment, except the cursor.
-        keys = [k for k in self.environment if (k != 'cursor')]
-        for k in keys: self.environment.destroy_object(k)
+        keys = [k for k in self.environment.keys() if (k != 'cursor')]
+        for k in keys: self._destroy_sphere(k)
         
         #pass
         
@@ -542,6 +837,16 @@ class Model:
         ## Initialize the cursor.
         #self.environment.initialize_object('cursor')
         
+    def _exit_timed_state(self, event_data=None):
+        """ Terminate a state that is only subject to a timeout.
+        
+        The exit callbacks of most states do nothing more than reset the 
+        timeout timer. Those callbacks are aliases of this method.
+        """
+        
+        # Reset the timeout timer.
+        self.cancel_timeout()
+        
     def on_enter_intertrial(self, event_data=None):
         """ Initialize the "intertrial" state.
         
@@ -556,11 +861,7 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('intertrial')
         
-    def on_exit_intertrial(self, event_data=None):
-        """ Terminate the "intertrial" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_intertrial = _exit_timed_state
         
     def on_enter_trial_setup(self, event_data=None):
         """ Set up a trial.
@@ -573,10 +874,10 @@ class Model:
         """
         
         # Create the target.
-        self.environment.initialize_sphere('target')
+        self._initialize_sphere('target')
         
         # Ensure that the target does not yet affect the task.
-        self.environment.set_radius(0, key='target')
+        self._set_radius(0, key='target')
         
         # Set a random target index.
         self.target_index = self.choose_random_target_index()
@@ -601,7 +902,7 @@ class Model:
         """
         
         # Clear the target.
-        self.environment.destroy_sphere('target')
+        self._destroy_sphere('target')
         
         # Automatically transition to the intertrial state.
         self.trigger('end_trial')
@@ -621,11 +922,7 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('move_a')
         
-    def on_exit_move_a(self, event_data=None):
-        """ Terminate the "move_a" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_move_a = _exit_timed_state
         
     def on_enter_hold_a(self, event_data=None):
         """ Initialize the "hold_a" state. """
@@ -633,21 +930,16 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('hold_a')
         
-    def on_exit_hold_a(self, event_data=None):
-        """ Terminate the "hold_a" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_hold_a = _exit_timed_state
         
     def on_enter_delay_a(self, event_data=None):
         """ Initialize the "delay_a" state. """
         
         # Initialize the cue.
-        self.environment.initialize_sphere('cue')        
+        self._initialize_sphere('cue')        
         
         # Initialize shorthand.
         target_key = list(self.targets)[self.target_index]
-        target = self.targets[target_key]
         self.log(f'Setting target cue: {target_key}')
         
         # Update the cue, such that it matches the appearance of the active 
@@ -656,8 +948,8 @@ class Model:
         self.update_target_color(key='cue')
         
         # Set the cue position.
-        xyz = target['position']
-        self.environment.set_position(**xyz, key='cue')
+        xyz = self._target_xyz[self.target_index]
+        self._set_position_xyz(xyz, key='cue')
         
         # Set the timeout timer.
         self.set_parameterized_timeout('delay_a')
@@ -669,33 +961,24 @@ class Model:
         self.cancel_timeout()
         
         # Initialize the cue.
-        self.environment.destroy_sphere('cue')        
+        self._destroy_sphere('cue')        
         
     def on_enter_move_b(self, event_data=None):
         """ Initialize the "move_b" state. """
         
-        # Initialize shorthand.
-        target_key = list(self.targets)[self.target_index]
-        target = self.targets[target_key]
-        #self.log(f'Setting target: {target_key}')
-        
         # Update the target to match the active target parameter values, or 
         # the default target parameter values, if unspecified.
         self.update_target_radius()
         self.update_target_color()
         
         # Set the target position.
-        xyz = target['position']
-        self.environment.set_position(**xyz, key='target')
+        xyz = self._target_xyz[self.target_index]
+        self._set_position_xyz(xyz, key='target')
         
         # Set the timeout timer.
         self.set_parameterized_timeout('move_b')
         
-    def on_exit_move_b(self, event_data=None):
-        """ Terminate the "move_b" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_move_b = _exit_timed_state
         
     def on_enter_hold_b(self, event_data=None):
         """ Initialize the "hold_b" state. """
@@ -703,17 +986,13 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('hold_b')
         
-    def on_exit_hold_b(self, event_data=None):
-        """ Terminate the "hold_b" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_hold_b = _exit_timed_state
         
     def on_enter_delay_b(self, event_data=None):
         """ Initialize the "delay_b" state. """
         
         # Initialize the cue.
-        self.environment.initialize_sphere('cue')        
+        self._initialize_sphere('cue')        
         
         # Initialize shorthand.
         #target_key = list(self.targets)[self.target_index]
@@ -727,8 +1006,7 @@ class Model:
         self.update_target_color(key='cue', from_active_target=False)
         
         # Set the cue position.
-        #xyz = target['position']
-        self.environment.set_position(0.0,0.0,0.0, key='cue')
+        self._set_position_xyz(home_position, key='cue')
         
         # Move the target to the home position.
         #self.set_home_target()
@@ -743,7 +1021,7 @@ class Model:
         self.cancel_timeout()
         
         # Initialize the cue.
-        self.environment.destroy_sphere('cue')    
+        self._destroy_sphere('cue')    
         
     def on_enter_move_c(self, event_data=None):
         """ Initialize the "move_c" state. """
@@ -760,11 +1038,7 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('move_c')
         
-    def on_exit_move_c(self, event_data=None):
-        """ Terminate the "move_c" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_move_c = _exit_timed_state
         
     def on_enter_hold_c(self, event_data=None):
         """ Initialize the "hold_c" state. """
@@ -772,11 +1046,7 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('hold_c')
         
-    def on_exit_hold_c(self, event_data=None):
-        """ Terminate the "hold_c" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_hold_c = _exit_timed_state
         
     def on_enter_success(self, event_data=None):
         """ Initialize the "success" state. """
@@ -784,11 +1054,7 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('success')
         
-    def on_exit_success(self, event_data=None):
-        """ Terminate the "success" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_success = _exit_timed_state
         
     def on_enter_failure(self, event_data=None):
         """ Initialize the "failure" state. """
@@ -796,14 +1062,16 @@ class Model:
         # Set the timeout timer.
         self.set_parameterized_timeout('failure')
                 
-    def on_exit_failure(self, event_data=None):
-        """ Terminate the "failure" state. """
-        
-        # Reset the timeout timer.
-        self.cancel_timeout()
+    on_exit_failure = _exit_timed_state
     
   
 
+# Re-seed the shared target generator in the child process after a fork, where 
+# the platform supports it, so that forked processes choose different targets.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Model._prng.seed)
+
+
 # Run doctests.
 if __name__ == '__main__':
     import doctest
@@ -0,0 +1,74 @@
+""" Test that testing many spheres at once agrees with testing each sphere 
+    individually.
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import standard Python packages.
+import random
+
+# Import unittest.
+import unittest
+
+# Import numpy.
+import numpy
+
+# Local imports.
+from delay_out_center_task import Environment
+from delay_out_center_task.environment import _engaged_kernel
+
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def setUp(self):
+        """ Initialize spheres at random positions, with random radii, along 
+            with spheres that barely touch the cursor.
+        """
+        prng = random.Random(0)
+        environment = Environment()
+        environment.set_radius(0.5)
+        self.keys = []
+        for n in range(500):
+            key = f'sphere_{n}'
+            environment.initialize_sphere(key=key)
+            environment.set_radius(prng.uniform(0.0, 1.0), key=key)
+            environment.set_position(*(prng.uniform(-2.0, 2.0) for _ in 'xyz'), 
+                                     key=key)
+            self.keys.append(key)
+        for (n, xyz) in enumerate([(1.0, 0.0, 0.0), (0.6, 0.8, 0.0)]):
+            key = f'boundary_{n}'
+            environment.initialize_sphere(key=key)
+            environment.set_radius(0.5, key=key)
+            environment.set_position(*xyz, key=key)
+            self.keys.append(key)
+        self.environment = environment
+        self.expected = [environment.is_engaged(k) for k in self.keys]
+        
+    def test_many(self):
+        engaged = self.environment.is_engaged_many(self.keys)
+        assert(engaged.tolist() == self.expected)
+        
+    def test_kernel(self):
+        """ Run the kernel uncompiled, whether or not numba is available. """
+        environment = self.environment
+        positions = numpy.array(environment._position)
+        radii = numpy.array(environment._radius)
+        index = numpy.array([environment._index[k] for k in self.keys])
+        engaged = numpy.empty(len(index), dtype=bool)
+        _engaged_kernel(positions, radii, index, environment._index['cursor'], 
+                        engaged)
+        assert(engaged.tolist() == self.expected)
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,145 @@
+""" Test that the task model manipulates the environment only via the 
+    documented environment interface, such that derived environments observe 
+    every change.
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import unittest.
+import unittest
+
+# Local imports.
+from delay_out_center_task import Environment
+from delay_out_center_task import Model
+from delay_out_center_task import Machine
+
+
+# Define the expected home target position.
+HOME = (0.0, 0.0, 0.0)
+
+
+# Define an environment that records calls to the documented setters.
+class RecordingEnvironment(Environment):
+    """ An environment that records calls to the documented setters. """
+    
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        super().__init__(*args, **kwargs)
+        
+    def set_position(self, x=0.0, y=0.0, z=0.0, key='cursor'):
+        self.calls.append(('set_position', key, (x, y, z)))
+        super().set_position(x, y, z, key=key)
+        
+    def set_color(self, r=0.0, g=0.0, b=0.0, a=1.0, key='cursor'):
+        self.calls.append(('set_color', key, (r, g, b, a)))
+        super().set_color(r, g, b, a, key=key)
+    
+  
+
+# Define test case.
+class TestCase(unittest.TestCase):
+    """ Test case for derived environments. """
+    
+    def setUp(self):
+        """ Initialize the environment, model, and state machine. """
+        self.environment = RecordingEnvironment()
+        self.model = Model(environment=self.environment, 
+                           log=lambda m: None, 
+                           auto_timeout=False)
+        self.machine = Machine(model=self.model, verbose=False)
+        
+    def trigger(self, event, expected_state):
+        """ Trigger a state transition, and clear the recorded calls. """
+        self.environment.calls.clear()
+        self.machine.fire(event)
+        assert(self.model.state == expected_state)
+        
+    def values(self, setter, key):
+        """ Values set for an object via a setter, since the last transition. 
+        """
+        return [c[2] for c in self.environment.calls 
+                     if (c[0] == setter) and (c[1] == key)]
+        
+    def positions(self, key):
+        """ Positions set for an object, since the last transition. """
+        return self.values('set_position', key)
+        
+    def colors(self, key):
+        """ Colors set for an object, since the last transition. """
+        return self.values('set_color', key)
+        
+    def test_outer_target_positions(self):
+        """ Verify that cue and outer target moves reach `set_position`. """
+        
+        # Advance to the `delay_a` state.
+        self.trigger('start_block', 'intertrial')
+        self.trigger('timeout', 'move_a')
+        self.trigger('target_engaged', 'hold_a')
+        self.trigger('timeout', 'delay_a')
+        
+        # The cue is moved to the position of the active target.
+        xyz = self.environment.get_position('cue')
+        assert(xyz in self.positions('cue'))
+        
+        # The target is moved to the cue position, upon entering `move_b`.
+        self.trigger('timeout', 'move_b')
+        assert(self.positions('target') == [xyz])
+        
+    def test_home_positions(self):
+        """ Verify that home target and cue moves reach `set_position`. """
+        
+        # The target is moved to the home position, upon entering `move_a`. 
+        # The target is also placed at the origin when it is initialized, 
+        # during `trial_setup`.
+        self.trigger('start_block', 'intertrial')
+        self.trigger('timeout', 'move_a')
+        assert(self.positions('target') == [HOME, HOME])
+        
+        # Advance to the `delay_b` state. The cue is initialized, and then 
+        # moved to the home position.
+        self.trigger('target_engaged', 'hold_a')
+        self.trigger('timeout', 'delay_a')
+        self.trigger('timeout', 'move_b')
+        self.trigger('target_engaged', 'hold_b')
+        self.trigger('timeout', 'delay_b')
+        assert(self.positions('cue') == [HOME, HOME])
+        
+        # The target returns to the home position, upon entering `move_c`.
+        self.trigger('timeout', 'move_c')
+        assert(self.positions('target') == [HOME])
+        
+    def test_colors(self):
+        """ Verify that cursor and target colors reach `set_color`. """
+        
+        # The cursor color is updated during `trial_setup`, and the target 
+        # color upon entering `move_a`. Both are set from the parameters.
+        self.trigger('start_block', 'intertrial')
+        self.trigger('timeout', 'move_a')
+        parameters = self.model.parameters
+        cursor_rgba = tuple(parameters[f'cursor.color.{k}'] for k in 'rgba')
+        target_rgba = tuple(parameters[f'target.color.{k}'] for k in 'rgba')
+        assert(self.colors('cursor') == [cursor_rgba])
+        assert(self.colors('target')[-1] == target_rgba)
+        
+    def test_target_record_color(self):
+        """ Verify that the color of a target record reaches `set_color`, 
+            with unspecified channels set to the defaults.
+        """
+        self.trigger('start_block', 'intertrial')
+        self.model.targets = {0: dict(position=dict(x=1.0), 
+                                      color=dict(r=1.0, a=0.5))}
+        self.model.target_index = 0
+        self.model.update_target_color(key='cursor')
+        assert(self.colors('cursor') == [(1.0, 0.0, 0.0, 0.5)])
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
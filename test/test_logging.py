@@ -0,0 +1,59 @@
+""" Test buffered logging by the state machine. """
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import standard Python packages.
+import io
+import os
+import sys
+import time
+import contextlib
+
+# Import unittest.
+import unittest
+
+# Local imports.
+from delay_out_center_task import Machine
+
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def test_dropped(self):
+        machine = Machine(log_buffer_size=2)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for n in range(1000): machine.log(f'Message {n}')
+            machine.flush_log()
+        assert('messages dropped' in output.getvalue())
+        assert('Message 999' in output.getvalue())
+        
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_fork(self):
+        
+        # Ensure that the writer thread is running in the parent.
+        machine = Machine(log_buffer_size=16)
+        
+        # Verify that buffered messages are written in the child process.
+        pid = os.fork()
+        if pid == 0:
+            sys.stdout = io.StringIO()
+            machine.start_block()
+            time.sleep(0.5)
+            written = 'State: intertrial' in sys.stdout.getvalue()
+            os._exit(0 if (written and not machine._log_buffer) else 1)
+        (_, status) = os.waitpid(pid, 0)
+        assert(os.WIFEXITED(status) and (os.WEXITSTATUS(status) == 0))
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,120 @@
+""" Test the handling of invalid triggers by the state machine, in machine
+    configurations other than the default.
+"""
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import standard Python packages.
+import enum
+
+# Import unittest.
+import unittest
+
+# Import the transitions state machine package.
+import transitions
+
+# Local imports.
+from delay_out_center_task import Machine
+
+
+# Define a chain of transitions between four states.
+STATES = ['a', 'b', 'c', 'd']
+TRANSITIONS = [dict(trigger='go',  source='a', dest='b'),
+               dict(trigger='go2', source='b', dest='c'),
+               dict(trigger='go3', source='c', dest='d'),
+              ]
+
+# Define states as an enumeration.
+class States(enum.Enum):
+    A = 1
+    B = 2
+
+
+# Define a model that triggers further events upon entering a state.
+class ChainModel:
+    def on_enter_b(self, event_data):
+        self.trigger('go2')
+        self.trigger('go3')
+    
+  
+
+# Define a model that fires further events, via the machine, upon entering a 
+# state.
+class FireChainModel:
+    def on_enter_b(self, event_data):
+        event_data.machine.fire('go2')
+        event_data.machine.fire('go3')
+    
+  
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def test_queued(self):
+        model = ChainModel()
+        machine = Machine(model=model, states=STATES, transitions=TRANSITIONS,
+                          initial='a', verbose=False, queued=True)
+        assert(model.go())
+        assert(model.state == 'd')
+        
+    def test_queued_fire(self):
+        model = FireChainModel()
+        machine = Machine(model=model, states=STATES, transitions=TRANSITIONS,
+                          initial='a', verbose=False, queued=True)
+        assert(machine.fire('go'))
+        assert(model.state == 'd')
+        
+    def test_enum_states(self):
+        transitions_ = [dict(trigger='go', source=States.A, dest=States.B)]
+        machine = Machine(states=States, transitions=transitions_,
+                          initial=States.A, verbose=False)
+        assert(machine.go())
+        assert(machine.state is States.B)
+        assert(not machine.go())
+        
+    def test_enum_states_fire(self):
+        transitions_ = [dict(trigger='timeout', source=States.A, dest=States.B)]
+        machine = Machine(states=States, transitions=transitions_,
+                          initial=States.A, verbose=False)
+        assert(machine.fire('timeout'))
+        assert(machine.state is States.B)
+        assert(not machine.fire('timeout'))
+        
+    def test_finalize_event(self):
+        finalized = []
+        machine = Machine(states=STATES, transitions=TRANSITIONS, initial='a', 
+                          verbose=False, 
+                          finalize_event=lambda e: finalized.append(e.event.name))
+        assert(not machine.go2())
+        assert(not machine.fire('go3'))
+        assert(machine.state == 'a')
+        assert(finalized == ['go2', 'go3'])
+        
+    def test_strict_state(self):
+        states = [transitions.State('a', ignore_invalid_triggers=False), 'b']
+        transitions_ = [dict(trigger='go', source='b', dest='a')]
+        machine = Machine(states=states, transitions=transitions_,
+                          initial='b', verbose=False)
+        assert(machine.go())
+        with self.assertRaises(transitions.MachineError): machine.go()
+        
+    def test_strict_state_fire(self):
+        states = [transitions.State('a', ignore_invalid_triggers=False), 'b']
+        transitions_ = [dict(trigger='go', source='b', dest='a')]
+        machine = Machine(states=states, transitions=transitions_,
+                          initial='b', verbose=False)
+        assert(machine.fire('go'))
+        with self.assertRaises(transitions.MachineError): machine.fire('go')
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,55 @@
+""" Test the random selection of targets by the task model. """
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import standard Python packages.
+import os
+
+# Import unittest.
+import unittest
+
+# Local imports.
+from delay_out_center_task import Environment
+from delay_out_center_task import Model
+
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def choose_targets(self, n=32):
+        model = Model(environment=Environment(), 
+                      log=lambda m: None, 
+                      auto_timeout=False)
+        return tuple(model.choose_random_target_index() for _ in range(n))
+        
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_fork(self):
+        
+        # Report the targets chosen by each of several child processes.
+        sequences = set()
+        for _ in range(3):
+            (r, w) = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(r)
+                os.write(w, bytes(self.choose_targets()))
+                os._exit(0)
+            os.close(w)
+            with os.fdopen(r, 'rb') as f: sequences.add(f.read())
+            os.waitpid(pid, 0)
+        
+        # Verify that the children did not share a sequence.
+        assert(len(sequences) == 3)
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,89 @@
+""" Test loading target records from a YAML file. """
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import standard Python packages.
+import os
+import tempfile
+
+# Import unittest.
+import unittest
+
+# Local imports.
+from delay_out_center_task import Environment
+from delay_out_center_task import Model
+from delay_out_center_task.model import _load_yaml
+
+
+# Define target records, in YAML format.
+TARGETS_YAML = """
+0: {position: {x: 1.0, y: 0.0, z: 0.0}}
+1: {position: {x: 0.0, y: 1.0, z: 0.0}}
+"""
+
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def setUp(self):
+        (fd, self.filepath) = tempfile.mkstemp(suffix='.yaml')
+        with os.fdopen(fd, 'w') as f: f.write(TARGETS_YAML)
+        _load_yaml.cache_clear()
+        
+    def tearDown(self):
+        os.remove(self.filepath)
+        
+    def create_model(self):
+        model = Model(environment=Environment(), 
+                      log=lambda m: None, 
+                      auto_timeout=False)
+        model.load_targets(self.filepath)
+        return model
+        
+    def test_load(self):
+        model = self.create_model()
+        assert(model.targets[1]['position'] == {'x': 0.0, 'y': 1.0, 'z': 0.0})
+        assert(model._target_xyz == ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0)))
+        
+    def test_assign(self):
+        model = self.create_model()
+        model.targets = {0: {'position': {'x': -1.0, 'z': 2.0}}}
+        assert(model._target_xyz == ((-1.0, 0.0, 2.0),))
+        
+    def test_cache(self):
+        self.create_model()
+        self.create_model()
+        cache_info = _load_yaml.cache_info()
+        assert((cache_info.hits, cache_info.misses) == (1, 1))
+        
+    def test_copy(self):
+        m1 = self.create_model()
+        m2 = self.create_model()
+        assert(m1.targets == m2.targets)
+        assert(m1.targets is not m2.targets)
+        m1.targets[0]['position']['x'] = 2.0
+        m3 = self.create_model()
+        assert(m3.targets[0]['position']['x'] == 1.0)
+        
+    def test_modified(self):
+        self.create_model()
+        with open(self.filepath, 'a') as f: 
+            f.write('2: {position: {x: -1.0, y: 0.0, z: 0.0}}\n')
+        stat = os.stat(self.filepath)
+        os.utime(self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        model = self.create_model()
+        assert(len(model.targets) == 3)
+        assert(_load_yaml.cache_info().misses == 2)
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
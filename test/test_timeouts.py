@@ -0,0 +1,59 @@
+""" Test automatic timeouts of the task model, under the state machine. """
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import unittest.
+import unittest
+
+# Local imports.
+from delay_out_center_task import Environment
+from delay_out_center_task import Model
+from delay_out_center_task import Machine
+
+
+# Define the timeout parameters.
+PARAMETERS = {'timeout_s.intertrial': 0.050, 
+              'timeout_s.move_a':     0.500,
+             }
+
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def setUp(self):
+        self.model = Model(environment=Environment(), 
+                           parameters=dict(PARAMETERS), 
+                           log=lambda m: None)
+        self.machine = Machine(model=self.model, verbose=False)
+        
+    def tearDown(self):
+        self.model.cancel_timeout()
+        
+    def test_consecutive_timeouts(self):
+        model = self.model
+        model.start_block()
+        
+        # The intertrial timeout leads to the `move_a` state, which requests 
+        # a new timeout. Waiting threads are released once the transition is 
+        # complete, but the flag is not left set.
+        assert(model.timeout_event.wait(1.0))
+        assert(model.state == 'move_a')
+        assert(not model.timeout_event.is_set())
+        
+        # The next wait is not released until the `move_a` timeout expires.
+        assert(not model.timeout_event.wait(0.050))
+        assert(model.timeout_event.wait(1.0))
+        assert(model.state == 'failure')
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
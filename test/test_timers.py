@@ -0,0 +1,51 @@
+""" Test the timers served by the environment timer manager. """
+
+# Copyright 2022 Carnegie Mellon University Neuromechatronics Lab (a.whit)
+# 
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# 
+# Contact: a.whit (nml@whit.contact)
+
+
+# Import standard Python packages.
+import os
+import threading
+
+# Import unittest.
+import unittest
+
+# Local imports.
+from delay_out_center_task import Environment
+
+
+# Define the test case.
+class TestCase(unittest.TestCase):
+    
+    def start_timer(self, environment, interval=0.010):
+        """ Start a timer, and return an event that is set when it fires. """
+        fired = threading.Event()
+        environment.timer(interval, fired.set).start()
+        return fired
+        
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_fork(self):
+        
+        # Ensure that the scheduler thread is running in the parent.
+        environment = Environment()
+        assert(self.start_timer(environment).wait(1.0))
+        
+        # Verify that a timer fires in the child process.
+        pid = os.fork()
+        if pid == 0:
+            fired = self.start_timer(environment).wait(1.0)
+            os._exit(0 if fired else 1)
+        (_, status) = os.waitpid(pid, 0)
+        assert(os.WIFEXITED(status) and (os.WEXITSTATUS(status) == 0))
+        
+    
+  
+
+# Main.
+if __name__ == '__main__': unittest.main()
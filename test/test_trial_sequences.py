@@ -22,33 +22,67 @@ from delay_out_center_task import Model
 from delay_out_center_task import Machine
 
 
+# Define the expected home target position.
+HOME = (0.0, 0.0, 0.0)
+
+# Define the sequence of steps in a successful trial, up to the final hold. 
+# Each step names a `_trigger_<step>` method of the test case, which triggers 
+# an event and verifies the outcome.
+TRIAL_SEQUENCE = ('end_block',
+                  'start_block',
+                  'intertrial_timeout',
+                  'move_a_target_engaged',
+                  'hold_a_timeout',
+                  'delay_a_timeout',
+                  'move_b_target_engaged',
+                  'hold_b_timeout',
+                  'delay_b_timeout',
+                  'move_c_target_engaged',
+                 )
+
+
 # Define test case.
 class TestCase(unittest.TestCase):
     """ Test case for testing valid sequences of trial states. """
     
-    def setUp(self):
-        """ Initialize the environment, model, and state machine. """
-        
-        # Override the `timeout` trigger function, to disable automatic state 
-        # transitions in this local context. This is important for testing.
-        Model.timeout = lambda s, *a, **k: None
+    @classmethod
+    def setUpClass(cls):
+        """ Initialize the environment, model, and state machine, once for all 
+            tests in the test case.
+        """
         
         # Initialize the task environment.
-        self.environment = Environment()
+        cls.environment = Environment()
         
         # Initialize the behavioral model for the state machine.
-        self.model = Model(environment=self.environment)
+        # Disable automatic timeouts, so that expired timers do not cause state 
+        # transitions in this local context. This is important for testing.
+        cls.model = Model(environment=cls.environment, auto_timeout=False)
         
         # Initialize the state machine.
-        self.machine = Machine(model=self.model)
+        cls.machine = Machine(model=cls.model)
+        
+    def setUp(self):
+        """ Reset the environment, model, and state machine. """
+        
+        # Cancel any pending timeout, restore the environment to its initial 
+        # condition, and return to the inactive state, without invoking any 
+        # state callbacks.
+        self.model.cancel_timeout()
+        self.environment.reset()
+        self.machine.set_state('inactive')
         
     def tearDown(self):
         """ Terminate. """
         pass
         
     def trigger(self, event, expected_state=''):
-        """ Trigger a state transition. """
-        result = self.model.trigger(event)
+        """ Trigger a state transition.
+        
+        Events are dispatched via the transition table of the state machine. 
+        The README examples cover the `trigger` method of the model.
+        """
+        result = self.machine.fire(event)
         if expected_state: assert(self.state == expected_state)
         return result
         
@@ -57,13 +91,22 @@ class TestCase(unittest.TestCase):
         """ Current state of the state machine. """
         return self.model.state
     
+    def _run_trial_sequence(self, until):
+        """ Run the steps of the trial sequence, up to and including the 
+            specified step.
+        """
+        for step in TRIAL_SEQUENCE:
+            getattr(self, f'_trigger_{step}')()
+            if step == until: return
+        raise ValueError(f'Unknown trial sequence step: {until}')
+        
     def _trigger_end_block(self):
         """ """
         
         # Reset to inactive state.
         # Verify that the cursor is the only object in the environment.
         self.trigger('end_block', expected_state='inactive')
-        assert(list(self.environment.objects) == ['cursor'])
+        assert(self.environment.keys() == {'cursor'})
         
     def _trigger_start_block(self):
         """ """
@@ -83,8 +126,8 @@ class TestCase(unittest.TestCase):
         target_index = self.model.target_index
         self.trigger('timeout', expected_state='move_a')
         assert(self.model.target_index != target_index)
-        assert(self.environment.get_position('target') == (0.0, 0.0, 0.0))
-        assert('target' in self.environment.objects)
+        assert(self.environment.get_position('target') == HOME)
+        assert(self.environment.exists('target'))
         
     def _trigger_move_a_target_engaged(self):
         """ """
@@ -99,7 +142,7 @@ class TestCase(unittest.TestCase):
         # Transition to the delay state and start waiting.
         # Verify that a cue target has added to the environment.
         self.trigger('timeout', expected_state='delay_a')
-        assert('cue' in self.environment.objects)
+        assert(self.environment.exists('cue'))
         
     def _trigger_delay_a_timeout(self):
         """ """
@@ -113,7 +156,7 @@ class TestCase(unittest.TestCase):
         self.trigger('timeout', expected_state='move_b')
         assert(self.environment.get_position('target') != target_position)
         assert(self.environment.get_position('target') == cue_position)
-        assert('cue' not in self.environment.objects)
+        assert(not self.environment.exists('cue'))
         
     def _trigger_move_b_target_engaged(self):
         """ """
@@ -125,14 +168,25 @@ class TestCase(unittest.TestCase):
     def _trigger_hold_b_timeout(self):
         """ """
         
+        # Transition to the delay state and start waiting.
+        # Verify that a cue target has been added to the environment, at the 
+        # home position.
+        self.trigger('timeout', expected_state='delay_b')
+        assert(self.environment.exists('cue'))
+        assert(self.environment.get_position('cue') == HOME)
+        
+    def _trigger_delay_b_timeout(self):
+        """ """
+        
         # Transition to the move state and start waiting for Target C to be 
         # engaged.
         # Verify that the target has moved to the home position.
+        # Verify that the cue has been removed from the environment.
         target_position = self.environment.get_position('target')
-        home_position = (0.0, 0.0, 0.0)
         self.trigger('timeout', expected_state='move_c')
         assert(self.environment.get_position('target') != target_position)
-        assert(self.environment.get_position('target') == home_position)
+        assert(self.environment.get_position('target') == HOME)
+        assert(not self.environment.exists('cue'))
         
     def _trigger_move_c_target_engaged(self):
         """ """
@@ -147,21 +201,13 @@ class TestCase(unittest.TestCase):
         # Teardown.
         # Verify that the cursor is the only object in the environment.        
         self.trigger('timeout', expected_state='intertrial')
-        assert(list(self.environment.objects) == ['cursor'])
+        assert(self.environment.keys() == {'cursor'})
     
     def test_success(self):
         """ Verify a successful trial sequence. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
-        self._trigger_hold_a_timeout()
-        self._trigger_delay_a_timeout()
-        self._trigger_move_b_target_engaged()
-        self._trigger_hold_b_timeout()
-        self._trigger_move_c_target_engaged()
+        self._run_trial_sequence(until='move_c_target_engaged')
         
         # Success. Hold C timeout.
         self.trigger('timeout', expected_state='success')
@@ -169,21 +215,13 @@ class TestCase(unittest.TestCase):
         # Teardown.
         # Verify that the cursor is the only object in the environment.        
         self.trigger('timeout', expected_state='intertrial')
-        assert(list(self.environment.objects) == ['cursor'])
+        assert(self.environment.keys() == {'cursor'})
     
     def test_hold_c_failure(self):
         """ Verify a trial sequence that results in a final hold failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
-        self._trigger_hold_a_timeout()
-        self._trigger_delay_a_timeout()
-        self._trigger_move_b_target_engaged()
-        self._trigger_hold_b_timeout()
-        self._trigger_move_c_target_engaged()
+        self._run_trial_sequence(until='move_c_target_engaged')
         
         # Failure due to target disengagement.
         self.trigger('target_disengaged', expected_state='failure')
@@ -195,14 +233,7 @@ class TestCase(unittest.TestCase):
         """ Verify a trial sequence that results in a final move failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
-        self._trigger_hold_a_timeout()
-        self._trigger_delay_a_timeout()
-        self._trigger_move_b_target_engaged()
-        self._trigger_hold_b_timeout()
+        self._run_trial_sequence(until='delay_b_timeout')
         
         # Failure to engage target before timeout.
         self.trigger('timeout', expected_state='failure')
@@ -210,17 +241,23 @@ class TestCase(unittest.TestCase):
         # Teardown.
         self._trigger_failure_timeout()
     
+    def test_delay_b_failure(self):
+        """ Verify a trial sequence that results in a delay B failure. """
+        
+        # Trial sequence.
+        self._run_trial_sequence(until='hold_b_timeout')
+        
+        # Failure due to target disengagement during `delay_b`.
+        self.trigger('target_disengaged', expected_state='failure')
+        
+        # Teardown.
+        self._trigger_failure_timeout()
+    
     def test_hold_b_failure(self):
         """ Verify a trial sequence that results in a hold B failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
-        self._trigger_hold_a_timeout()
-        self._trigger_delay_a_timeout()
-        self._trigger_move_b_target_engaged()
+        self._run_trial_sequence(until='move_b_target_engaged')
         
         # Failure due to target disengagement during `hold_b`.
         self.trigger('target_disengaged', expected_state='failure')
@@ -232,12 +269,7 @@ class TestCase(unittest.TestCase):
         """ Verify a trial sequence that results in a hold B failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
-        self._trigger_hold_a_timeout()
-        self._trigger_delay_a_timeout()
+        self._run_trial_sequence(until='delay_a_timeout')
         
         # Failure due to target disengagement during `hold_b`.
         self.trigger('timeout', expected_state='failure')
@@ -249,11 +281,7 @@ class TestCase(unittest.TestCase):
         """ Verify a trial sequence that results in a hold B failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
-        self._trigger_hold_a_timeout()
+        self._run_trial_sequence(until='hold_a_timeout')
         
         # Failure due to target disengagement during `hold_b`.
         self.trigger('target_disengaged', expected_state='failure')
@@ -265,10 +293,7 @@ class TestCase(unittest.TestCase):
         """ Verify a trial sequence that results in a hold B failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
-        self._trigger_move_a_target_engaged()
+        self._run_trial_sequence(until='move_a_target_engaged')
         
         # Failure due to target disengagement during `hold_b`.
         self.trigger('target_disengaged', expected_state='failure')
@@ -280,9 +305,7 @@ class TestCase(unittest.TestCase):
         """ Verify a trial sequence that results in a hold B failure. """
         
         # Trial sequence.
-        self._trigger_end_block()
-        self._trigger_start_block()
-        self._trigger_intertrial_timeout()
+        self._run_trial_sequence(until='intertrial_timeout')
         
         # Failure due to target disengagement during `hold_b`.
         self.trigger('timeout', expected_state='failure')